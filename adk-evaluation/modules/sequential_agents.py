@@ -7,11 +7,20 @@ with individual agents responsible for specific steps using actual AI generation
 
 import os
 import json
+import hashlib
+import heapq
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
+from pathlib import Path
 
 # Load environment variables
 try:
@@ -33,7 +42,7 @@ try:
     if api_key:
         genai.configure(api_key=api_key)
         logger = logging.getLogger(__name__)
-        logger.info(f"🔑 Gemini API configured successfully (key: {api_key[:10]}...)")
+        logger.info("🔑 Gemini API configured successfully (key: %s...)", api_key[:10])
     else:
         GEMINI_AVAILABLE = False
         logger = logging.getLogger(__name__)
@@ -48,6 +57,113 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keywords that raise a section's importance score (built once, not per call)
+IMPORTANCE_KEYWORDS = (
+    'important', 'key', 'critical', 'essential', 'main', 'primary',
+    'significant', 'major', 'crucial', 'fundamental', 'core'
+)
+
+# Fallback theme detection keywords, in the order themes are reported
+THEME_KEYWORDS: Tuple[Tuple[str, frozenset], ...] = (
+    ('Business Strategy', frozenset({'business', 'strategy', 'market', 'competitive', 'growth'})),
+    ('Technology', frozenset({'technology', 'ai', 'automation', 'digital', 'innovation'})),
+    ('Data & Analytics', frozenset({'data', 'analytics', 'insights', 'metrics', 'analysis'})),
+    ('Customer Experience', frozenset({'customer', 'experience', 'satisfaction', 'service'})),
+    ('Finance', frozenset({'finance', 'revenue', 'cost', 'profit', 'investment'})),
+    ('Operations', frozenset({'operations', 'process', 'efficiency', 'workflow'})),
+    ('Leadership', frozenset({'leadership', 'management', 'team', 'culture'}))
+)
+
+# Fixed responses used when Gemini is unavailable
+FALLBACK_SLIDE_STRUCTURE = """Based on the content analysis, here's the recommended slide structure:
+
+Slide 1 (Title): Introduction and Overview
+Slide 2 (Content): Key Concepts and Main Points  
+Slide 3 (Content): Supporting Details and Examples
+Slide 4 (Content): Analysis and Implications
+Slide 5 (Conclusion): Summary and Next Steps"""
+
+FALLBACK_BULLET_POINTS = """• Key insight from the analyzed content
+• Supporting evidence and examples
+• Important implications to consider
+• Actionable recommendations
+• Future considerations and next steps"""
+
+FALLBACK_COLOR_PALETTE = "#2c3e50, #3498db, #e74c3c, #f39c12, #27ae60"
+
+FALLBACK_CONTENT = "Professional content generated based on the provided context and requirements."
+
+# Fixed slide bullets, shared instead of rebuilt per slide; callers that put
+# them into slide output take a list() copy so slides stay independent
+SECTION_FALLBACK_BULLETS = ("Key insight from this section", "Important consideration", "Actionable takeaway")
+CONCLUSION_BULLETS = ("Key insights from today's presentation", "Actionable next steps", "Questions and discussion")
+GENERIC_SLIDE_POINTS = ("Key point 1", "Key point 2", "Key point 3")
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text lazily (same pieces as text.split('\n'))"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+def _count_words(text: str, chunk_size: int = 1 << 16) -> int:
+    """
+    Count whitespace-separated words (same result as len(text.split())) without
+    materializing the word list; large texts are split in bounded chunks.
+    """
+    count = 0
+    inside_word = False
+    for start in range(0, len(text), chunk_size):
+        chunk = text[start:start + chunk_size]
+        count += len(chunk.split())
+        # A word straddling the chunk boundary was counted twice
+        if inside_word and not chunk[0].isspace():
+            count -= 1
+        inside_word = not chunk[-1].isspace()
+    return count
+
+# Runs of text between periods; scanned lazily so parsing can stop early
+# instead of splitting the whole content up front
+_SENTENCE_PATTERN = re.compile(r'[^.]+')
+
+def _parse_bullet_points(content: str) -> Tuple[str, ...]:
+    """Extract up to 4 bullet points from content"""
+    bullet_points = []
+    
+    for match in _SENTENCE_PATTERN.finditer(content):
+        sentence = match.group().strip()
+        if 10 < len(sentence) < 100:
+            bullet_points.append(sentence + '.')
+            
+            if len(bullet_points) >= 4:  # Max 4 bullet points per slide
+                break
+    
+    # Ensure we have at least 2 bullet points
+    if len(bullet_points) < 2:
+        return SECTION_FALLBACK_BULLETS
+    
+    return tuple(bullet_points)
+
+def _parse_key_message(content: str) -> str:
+    """Extract the first sentence suitable as a key message from content"""
+    # Walk period to period instead of splitting everything; the first match
+    # is usually within the first sentence or two
+    start = 0
+    length = len(content)
+    while start <= length:
+        end = content.find('.', start)
+        if end == -1:
+            end = length  # Text after the last period is a sentence too
+        sentence = content[start:end].strip()
+        if 20 < len(sentence) < 150:
+            return sentence + '.'
+        start = end + 1
+    return "Key insight from this section."
+
 class WorkflowStatus(Enum):
     """Workflow execution status"""
     PENDING = "pending"
@@ -63,68 +179,245 @@ class StepResult:
     status: WorkflowStatus
     data: Dict[str, Any]
     processing_time: float
-    timestamp: str
+    timestamp: float = field(default_factory=time.time)  # Epoch seconds; formatted on demand
     error_message: Optional[str] = None
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """Timestamp as an ISO-8601 string in local time"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+class StreamInterruptedError(RuntimeError):
+    """A streamed Gemini response failed after part of it was delivered"""
+
+@dataclass(frozen=True)
+class NormalizedText:
+    """Text together with its lowercased form, computed once and shared by helpers"""
+    raw: str
+    lower: str
+    
+    @classmethod
+    def from_text(cls, text: str) -> "NormalizedText":
+        return cls(raw=text, lower=text.lower())
+
+def _completed_step(step_name: str, data: Dict[str, Any], start_time: float) -> StepResult:
+    """Build the StepResult for a step that finished successfully"""
+    return StepResult(
+        step_name=step_name,
+        status=WorkflowStatus.COMPLETED,
+        data=data,
+        processing_time=time.perf_counter() - start_time
+    )
+
+def _failed_step(step_name: str, error: Exception, start_time: float) -> StepResult:
+    """Build the StepResult for a step that raised"""
+    return StepResult(
+        step_name=step_name,
+        status=WorkflowStatus.FAILED,
+        data={},
+        processing_time=time.perf_counter() - start_time,
+        error_message=str(error)
+    )
+
+def _run_agent(agent: Any, *args: Any) -> StepResult:
+    """
+    Run an agent step, turning any exception into a FAILED StepResult.
+    
+    Agents no longer wrap their own bodies in try/except; this is the single
+    place where step failures are caught and reported.
+    
+    Args:
+        agent: Workflow agent with step_number, agent_name and process()
+        *args: Positional arguments for the agent's process()
+        
+    Returns:
+        StepResult from the agent, or a FAILED StepResult if it raised
+    """
+    start_time = time.perf_counter()
+    try:
+        return agent.process(*args)
+    except Exception as e:
+        logger.error("❌ Step %s: %s failed: %s", agent.step_number, agent.agent_name, e)
+        return _failed_step(agent.agent_name, e, start_time)
 
 class GeminiContentGenerator:
     """
-    Gemini LLM integration for content generation
+    Gemini LLM integration for content generation.
+    
+    Only one instance exists per process, so every agent shares the same model.
     """
     
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
     def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        
         self.model_name = "gemini-2.5-flash"
         self.model = None
+        # Responses are cached on disk keyed by model + prompt so repeated runs
+        # over the same document skip the network round-trip entirely; the
+        # directory is process-wide like the instance, so it comes from the
+        # environment. Responses are sampled, so entries expire, and
+        # GEMINI_CACHE_DIR="" turns caching off for a fresh analysis every run.
+        cache_dir = os.getenv('GEMINI_CACHE_DIR', '.gemini_cache')
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl_seconds = int(os.getenv('GEMINI_CACHE_TTL_SECONDS', 7 * 24 * 60 * 60))
         if GEMINI_AVAILABLE:
             try:
                 self.model = genai.GenerativeModel(self.model_name)
-                logger.info(f"🤖 Gemini model '{self.model_name}' initialized")
+                logger.info("🤖 Gemini model '%s' initialized", self.model_name)
+                threading.Thread(target=self._warm_up, name="gemini-warm-up", daemon=True).start()
             except Exception as e:
-                logger.error(f"❌ Failed to initialize Gemini model: {e}")
+                logger.error("❌ Failed to initialize Gemini model: %s", e)
                 self.model = None
     
+    def _warm_up(self) -> None:
+        """Open the Gemini connection ahead of the first real request"""
+        try:
+            # count_tokens goes through the same client as generate_content but
+            # does not consume generation quota
+            self.model.count_tokens("ping")
+            logger.info("🔥 Gemini connection warmed up")
+        except Exception as e:
+            logger.debug("Gemini warm-up skipped: %s", e)
+    
+    @property
+    def offline(self) -> bool:
+        """True when no Gemini model is available and fixed fallbacks are used"""
+        return self.model is None
+    
     def generate_content(self, prompt: str, max_retries: int = 2) -> str:
         """Generate content using Gemini API with fallback"""
         if not self.model:
             return self._fallback_generation(prompt)
         
+        cache_key = self._cache_key(prompt)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info("💾 Using cached Gemini response")
+            return cached
+        
         for attempt in range(max_retries + 1):
             try:
                 response = self.model.generate_content(prompt)
                 if response.text:
-                    return response.text.strip()
+                    text = response.text.strip()
+                    self._store_cached_response(cache_key, text)
+                    return text
                 else:
-                    logger.warning(f"⚠️ Empty response from Gemini (attempt {attempt + 1})")
+                    logger.warning("⚠️ Empty response from Gemini (attempt %s)", attempt + 1)
             except Exception as e:
-                logger.warning(f"⚠️ Gemini API error (attempt {attempt + 1}): {e}")
+                logger.warning("⚠️ Gemini API error (attempt %s): %s", attempt + 1, e)
                 if attempt == max_retries:
                     logger.info("🔄 Falling back to structured generation")
                     return self._fallback_generation(prompt)
         
         return self._fallback_generation(prompt)
     
-    def _fallback_generation(self, prompt: str) -> str:
-        """Fallback content generation when Gemini is not available"""
-        if "slide structure" in prompt.lower():
-            return """Based on the content analysis, here's the recommended slide structure:
-
-Slide 1 (Title): Introduction and Overview
-Slide 2 (Content): Key Concepts and Main Points  
-Slide 3 (Content): Supporting Details and Examples
-Slide 4 (Content): Analysis and Implications
-Slide 5 (Conclusion): Summary and Next Steps"""
+    def generate_content_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream content from Gemini chunk by chunk so callers can overlap their
+        own work with generation. Uses the same cache and fallback as
+        generate_content.
         
-        elif "bullet points" in prompt.lower():
-            return """• Key insight from the analyzed content
-• Supporting evidence and examples
-• Important implications to consider
-• Actionable recommendations
-• Future considerations and next steps"""
+        Raises:
+            StreamInterruptedError: If the stream fails after some chunks were
+                already yielded
+        """
+        if not self.model:
+            yield self._fallback_generation(prompt)
+            return
         
-        elif "color palette" in prompt.lower():
-            return "#2c3e50, #3498db, #e74c3c, #f39c12, #27ae60"
+        cache_key = self._cache_key(prompt)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info("💾 Using cached Gemini response")
+            yield cached
+            return
+        
+        chunks = []
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+        except Exception as e:
+            logger.warning("⚠️ Gemini streaming error: %s", e)
+            if chunks:
+                # Part of the response is already with the caller; ending quietly
+                # would pass the truncated text off as the full response
+                raise StreamInterruptedError(f"Gemini stream interrupted after {len(chunks)} chunks: {e}") from e
+        
+        if chunks:
+            self._store_cached_response(cache_key, ''.join(chunks).strip())
+        else:
+            # Nothing was streamed, so let the retrying path take over
+            yield self.generate_content(prompt)
+    
+    def _cache_key(self, prompt: str) -> str:
+        """Build a stable cache key for a prompt"""
+        return hashlib.sha256(f"{self.model_name}\n{prompt}".encode('utf-8')).hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Look up an unexpired cached response on disk"""
+        if self.cache_dir is None:
+            return None
         
+        cache_file = self.cache_dir / f"{cache_key}.txt"
+        try:
+            if time.time() - cache_file.stat().st_mtime > self.cache_ttl_seconds:
+                return None
+            text = cache_file.read_text(encoding='utf-8')
+        except OSError:
+            return None
+        if not text:
+            return None  # Never a valid response; treat as a miss
+        return text
+    
+    def _store_cached_response(self, cache_key: str, text: str) -> None:
+        """Store a response on disk (disk errors are non-fatal)"""
+        if not text or self.cache_dir is None:
+            return
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a private temp file and rename it into place, so readers
+            # in other threads or processes never see a partially written file
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=self.cache_dir, prefix=f".{cache_key}.", suffix='.tmp', delete=False
+            ) as tmp_file:
+                tmp_path = tmp_file.name
+                tmp_file.write(text)
+            os.replace(tmp_path, self.cache_dir / f"{cache_key}.txt")
+        except OSError as e:
+            logger.warning("⚠️ Could not write Gemini response cache: %s", e)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
+    def _fallback_generation(self, prompt: str) -> str:
+        """Fallback content generation when Gemini is not available"""
+        prompt_lower = prompt.lower()
+        if "slide structure" in prompt_lower:
+            return FALLBACK_SLIDE_STRUCTURE
+        elif "bullet points" in prompt_lower:
+            return FALLBACK_BULLET_POINTS
+        elif "color palette" in prompt_lower:
+            return FALLBACK_COLOR_PALETTE
         else:
-            return "Professional content generated based on the provided context and requirements."
+            return FALLBACK_CONTENT
 
 # Initialize global content generator
 content_generator = GeminiContentGenerator()
@@ -134,24 +427,13 @@ class DocumentAnalysisAgent:
     Step 1: Enhanced Document Analysis Agent with Gemini LLM
     """
     
-    def __init__(self):
-        self.agent_name = "Document Analysis Agent"
-        self.step_number = 1
-    
-    def process(self, document_text: str) -> StepResult:
-        """
-        Analyze document using Gemini LLM for intelligent analysis
-        """
-        start_time = datetime.now()
-        logger.info(f"🔍 Step {self.step_number}: {self.agent_name} - Starting AI-powered analysis...")
-        
-        try:
-            # Use Gemini to analyze document structure and content
-            analysis_prompt = f"""
+    # Static prompt text, parsed once; keeping the bytes stable also keeps the
+    # response cache key stable
+    _ANALYSIS_PROMPT = """
 Analyze the following document and provide a structured analysis:
 
 Document Text:
-{document_text[:2000]}...
+{document_excerpt}...
 
 Please provide:
 1. A clear, engaging title for a presentation based on this content
@@ -162,111 +444,112 @@ Please provide:
 
 Format your response as a structured analysis.
 """
-            
-            ai_analysis = content_generator.generate_content(analysis_prompt)
-            logger.info(f"   🤖 AI analysis completed")
-            
-            # Extract structured information from AI response
-            title = self._extract_title_from_ai_analysis(ai_analysis, document_text)
-            themes = self._extract_themes_from_ai_analysis(ai_analysis)
-            sections = self._extract_sections_from_document(document_text, ai_analysis)
-            metadata = self._calculate_metadata(document_text)
-            
-            logger.info(f"   📄 Document title: {title}")
-            logger.info(f"   📝 Found {len(sections)} sections")
-            logger.info(f"   🎯 Identified themes: {', '.join(themes)}")
-            
-            result_data = {
-                "document_title": title,
-                "sections": sections,
-                "themes": themes,
-                "metadata": metadata,
-                "ai_analysis": ai_analysis,
-                "analysis_summary": {
-                    "total_sections": len(sections),
-                    "main_themes": themes[:3],
-                    "complexity": metadata.get("complexity_score", 3),
-                    "estimated_reading_time": metadata.get("estimated_reading_time", "5 minutes"),
-                    "recommended_slides": min(5, len(sections) + 2)  # +2 for title and conclusion
-                }
+    
+    def __init__(self):
+        self.agent_name = "Document Analysis Agent"
+        self.step_number = 1
+    
+    def process(self, document_text: str) -> StepResult:
+        """
+        Analyze document using Gemini LLM for intelligent analysis
+        """
+        start_time = time.perf_counter()
+        logger.info("🔍 Step %s: %s - Starting AI-powered analysis...", self.step_number, self.agent_name)
+        
+        # Use Gemini to analyze document structure and content; stream the
+        # analysis and do the document-only work while the rest of the
+        # response is still being generated
+        prompt = self._build_analysis_prompt(document_text)
+        analysis_stream = content_generator.generate_content_stream(prompt)
+        first_chunk = next(analysis_stream, "")
+        sections = self._extract_sections_from_document(document_text)
+        metadata = self._calculate_metadata(document_text)
+        
+        try:
+            ai_analysis = (first_chunk + ''.join(analysis_stream)).strip()
+        except StreamInterruptedError as e:
+            # Discard the partial text and get the whole response the retrying way
+            logger.warning("⚠️ %s; requesting the full analysis again", e)
+            ai_analysis = content_generator.generate_content(prompt)
+        logger.info("   🤖 AI analysis completed")
+        
+        # Extract structured information from AI response
+        title = self._extract_title_from_ai_analysis(ai_analysis, document_text)
+        themes = self._extract_themes_from_ai_analysis(NormalizedText.from_text(ai_analysis))
+        
+        logger.info("   📄 Document title: %s", title)
+        logger.info("   📝 Found %s sections", len(sections))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   🎯 Identified themes: %s", ', '.join(themes))
+        
+        result_data = {
+            "document_title": title,
+            "sections": sections,
+            "themes": themes,
+            "metadata": metadata,
+            "ai_analysis": ai_analysis,
+            "analysis_summary": {
+                "total_sections": len(sections),
+                "main_themes": themes[:3],
+                "complexity": metadata.get("complexity_score", 3),
+                "estimated_reading_time": metadata.get("estimated_reading_time", "5 minutes"),
+                "recommended_slides": min(5, len(sections) + 2)  # +2 for title and conclusion
             }
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"✅ Step {self.step_number}: AI-powered analysis completed in {processing_time:.2f}s")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.COMPLETED,
-                data=result_data,
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat()
-            )
-            
-        except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ Step {self.step_number}: Document analysis failed: {e}")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.FAILED,
-                data={},
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat(),
-                error_message=str(e)
-            )
+        }
+        
+        result = _completed_step(self.agent_name, result_data, start_time)
+        logger.info("✅ Step %s: AI-powered analysis completed in %.2fs", self.step_number, result.processing_time)
+        return result
+    
+    def _build_analysis_prompt(self, document_text: str) -> str:
+        """Build the Gemini prompt for document analysis"""
+        return self._ANALYSIS_PROMPT.format(document_excerpt=document_text[:2000])
     
     def _extract_title_from_ai_analysis(self, ai_analysis: str, document_text: str) -> str:
         """Extract title from AI analysis or document"""
-        # Try to find title in AI analysis first
-        lines = ai_analysis.split('\n')
-        for line in lines:
+        # Try to find title in AI analysis first (lines are scanned lazily since
+        # the title is almost always near the top)
+        for line in _iter_lines(ai_analysis):
             if 'title' in line.lower() and ':' in line:
                 title = line.split(':', 1)[1].strip()
                 if title and len(title) < 100:
                     return title.strip('"').strip("'")
         
         # Fallback to document analysis
-        lines = document_text.strip().split('\n')
-        for line in lines:
+        for line in _iter_lines(document_text):
             line = line.strip()
             if line and len(line) < 100 and not line.startswith('•'):
                 return line
         return "AI-Generated Presentation"
     
-    def _extract_themes_from_ai_analysis(self, ai_analysis: str) -> List[str]:
+    def _extract_themes_from_ai_analysis(self, text: NormalizedText) -> List[str]:
         """Extract themes from AI analysis"""
         themes = []
-        content_lower = ai_analysis.lower()
+        ai_analysis = text.raw
+        content_lower = text.lower
         
         # Look for themes in AI analysis
         if 'theme' in content_lower or 'topic' in content_lower:
-            lines = ai_analysis.split('\n')
-            for line in lines:
-                if ('theme' in line.lower() or 'topic' in line.lower()) and ':' in line:
+            # Lowercasing never adds or removes newlines, so the lowered lines
+            # line up with the original ones
+            lines = zip(ai_analysis.split('\n'), content_lower.split('\n'))
+            for line, line_lower in lines:
+                if ('theme' in line_lower or 'topic' in line_lower) and ':' in line:
                     theme_part = line.split(':', 1)[1].strip()
                     if theme_part:
                         themes.extend([t.strip().strip('-').strip() for t in theme_part.split(',') if t.strip()])
         
-        # Fallback theme detection
-        theme_keywords = {
-            'Business Strategy': ['business', 'strategy', 'market', 'competitive', 'growth'],
-            'Technology': ['technology', 'ai', 'automation', 'digital', 'innovation'],
-            'Data & Analytics': ['data', 'analytics', 'insights', 'metrics', 'analysis'],
-            'Customer Experience': ['customer', 'experience', 'satisfaction', 'service'],
-            'Finance': ['finance', 'revenue', 'cost', 'profit', 'investment'],
-            'Operations': ['operations', 'process', 'efficiency', 'workflow'],
-            'Leadership': ['leadership', 'management', 'team', 'culture']
-        }
-        
-        for theme, keywords in theme_keywords.items():
+        # Fallback theme detection. Each substring check stops at its first hit,
+        # which measured faster than tokenizing the text into a set once
+        for theme, keywords in THEME_KEYWORDS:
             if any(keyword in content_lower for keyword in keywords):
                 if theme not in themes:
                     themes.append(theme)
         
         return themes[:5] if themes else ['General Topics']
     
-    def _extract_sections_from_document(self, document_text: str, ai_analysis: str) -> List[Dict[str, Any]]:
-        """Extract sections using AI guidance"""
+    def _extract_sections_from_document(self, document_text: str) -> List[Dict[str, Any]]:
+        """Extract sections from the document text"""
         sections = []
         lines = document_text.split('\n')
         current_section = None
@@ -284,14 +567,7 @@ Format your response as a structured analysis.
                 
                 # Save previous section
                 if current_section and current_content:
-                    content_text = ' '.join(current_content)
-                    sections.append({
-                        "title": current_section,
-                        "content": content_text,
-                        "word_count": len(content_text.split()),
-                        "importance": self._calculate_section_importance(content_text),
-                        "themes": self._extract_themes_from_ai_analysis(content_text)
-                    })
+                    sections.append(self._create_section(current_section, current_content))
                 
                 # Start new section
                 current_section = line
@@ -302,37 +578,35 @@ Format your response as a structured analysis.
         
         # Add final section
         if current_section and current_content:
-            content_text = ' '.join(current_content)
-            sections.append({
-                "title": current_section,
-                "content": content_text,
-                "word_count": len(content_text.split()),
-                "importance": self._calculate_section_importance(content_text),
-                "themes": self._extract_themes_from_ai_analysis(content_text)
-            })
+            sections.append(self._create_section(current_section, current_content))
         
         # Limit to 3 most important sections (for 5-slide presentation)
         if len(sections) > 3:
-            sections.sort(key=lambda x: x['importance'] * x['word_count'], reverse=True)
-            sections = sections[:3]
-            logger.info(f"   🎯 Limited to top 3 most important sections")
+            sections = heapq.nlargest(3, sections, key=lambda x: x['importance'] * x['word_count'])
+            logger.info("   🎯 Limited to top 3 most important sections")
         
         return sections
     
-    def _calculate_section_importance(self, content: str) -> int:
+    def _create_section(self, title: str, content_lines: List[str]) -> Dict[str, Any]:
+        """Build a section entry, lowercasing its content only once"""
+        content_text = NormalizedText.from_text(' '.join(content_lines))
+        return {
+            "title": title,
+            "content": content_text.raw,
+            "word_count": _count_words(content_text.raw),
+            "importance": self._calculate_section_importance(content_text),
+            "themes": self._extract_themes_from_ai_analysis(content_text)
+        }
+    
+    def _calculate_section_importance(self, content: NormalizedText) -> int:
         """Calculate importance score for a section"""
-        importance_keywords = [
-            'important', 'key', 'critical', 'essential', 'main', 'primary',
-            'significant', 'major', 'crucial', 'fundamental', 'core'
-        ]
-        content_lower = content.lower()
-        score = sum(1 for keyword in importance_keywords if keyword in content_lower)
+        content_lower = content.lower
+        score = sum(1 for keyword in IMPORTANCE_KEYWORDS if keyword in content_lower)
         return max(1, score)
     
     def _calculate_metadata(self, document_text: str) -> Dict[str, Any]:
         """Calculate document metadata"""
-        words = document_text.split()
-        word_count = len(words)
+        word_count = _count_words(document_text)
         
         return {
             "word_count": word_count,
@@ -347,31 +621,13 @@ class ContentStructureAgent:
     Step 2: Enhanced Content Structure Agent with AI-powered slide planning
     """
     
-    def __init__(self):
-        self.agent_name = "Content Structure Agent"
-        self.step_number = 2
-    
-    def process(self, document_analysis: Dict[str, Any]) -> StepResult:
-        """
-        Create slide structure using AI recommendations
-        """
-        start_time = datetime.now()
-        logger.info(f"🏗️ Step {self.step_number}: {self.agent_name} - Creating AI-optimized slide structure...")
-        
-        try:
-            title = document_analysis.get("document_title", "Untitled Presentation")
-            sections = document_analysis.get("sections", [])
-            themes = document_analysis.get("themes", [])
-            ai_analysis = document_analysis.get("ai_analysis", "")
-            
-            # Use AI to determine optimal slide structure
-            structure_prompt = f"""
+    _STRUCTURE_PROMPT = """
 Based on this document analysis, create an optimal slide structure for a professional presentation:
 
 Title: {title}
-Themes: {', '.join(themes)}
-Sections: {len(sections)} content sections available
-AI Analysis: {ai_analysis[:500]}...
+Themes: {themes}
+Sections: {section_count} content sections available
+AI Analysis: {analysis_excerpt}...
 
 Create a slide-by-slide structure with:
 1. Title slide
@@ -386,55 +642,64 @@ For each slide, specify:
 
 Keep total slides to 5 maximum.
 """
-            
-            ai_structure = content_generator.generate_content(structure_prompt)
-            logger.info(f"   🤖 AI structure planning completed")
-            
-            # Create slide structure
-            slides = self._create_ai_guided_slide_structure(title, sections, themes, ai_structure)
-            
-            # Calculate presentation metadata
-            duration = self._estimate_duration(slides)
-            layout_analysis = self._analyze_layouts(slides)
-            
-            logger.info(f"   📊 Created {len(slides)} slides")
-            logger.info(f"   ⏱️ Estimated duration: {duration}")
-            
-            result_data = {
-                "slide_structure": slides,
-                "presentation_metadata": {
-                    "total_slides": len(slides),
-                    "estimated_duration": duration,
-                    "layout_distribution": layout_analysis,
-                    "main_themes": themes[:3],
-                    "structure_approach": "AI-optimized"
-                },
-                "ai_structure_plan": ai_structure
-            }
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"✅ Step {self.step_number}: AI-guided structure completed in {processing_time:.2f}s")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.COMPLETED,
-                data=result_data,
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat()
-            )
-            
-        except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ Step {self.step_number}: Structure creation failed: {e}")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.FAILED,
-                data={},
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat(),
-                error_message=str(e)
-            )
+    
+    def __init__(self):
+        self.agent_name = "Content Structure Agent"
+        self.step_number = 2
+    
+    def process(self, document_analysis: Dict[str, Any]) -> StepResult:
+        """
+        Create slide structure using AI recommendations
+        """
+        start_time = time.perf_counter()
+        logger.info("🏗️ Step %s: %s - Creating AI-optimized slide structure...", self.step_number, self.agent_name)
+        
+        title = document_analysis.get("document_title", "Untitled Presentation")
+        sections = document_analysis.get("sections", [])
+        themes = document_analysis.get("themes", [])
+        ai_analysis = document_analysis.get("ai_analysis", "")
+        
+        # Use AI to determine optimal slide structure
+        ai_structure = content_generator.generate_content(
+            self._build_structure_prompt(title, sections, themes, ai_analysis)
+        )
+        logger.info("   🤖 AI structure planning completed")
+        
+        # Create slide structure
+        slides = self._create_ai_guided_slide_structure(title, sections, themes, ai_structure)
+        
+        # Calculate presentation metadata
+        duration = self._estimate_duration(slides)
+        layout_analysis = self._analyze_layouts(slides)
+        
+        logger.info("   📊 Created %s slides", len(slides))
+        logger.info("   ⏱️ Estimated duration: %s", duration)
+        
+        result_data = {
+            "slide_structure": slides,
+            "presentation_metadata": {
+                "total_slides": len(slides),
+                "estimated_duration": duration,
+                "layout_distribution": layout_analysis,
+                "main_themes": themes[:3],
+                "structure_approach": "AI-optimized"
+            },
+            "ai_structure_plan": ai_structure
+        }
+        
+        result = _completed_step(self.agent_name, result_data, start_time)
+        logger.info("✅ Step %s: AI-guided structure completed in %.2fs", self.step_number, result.processing_time)
+        return result
+    
+    def _build_structure_prompt(self, title: str, sections: List[Dict[str, Any]],
+                                themes: List[str], ai_analysis: str) -> str:
+        """Build the Gemini prompt for slide structure planning"""
+        return self._STRUCTURE_PROMPT.format(
+            title=title,
+            themes=', '.join(themes),
+            section_count=len(sections),
+            analysis_excerpt=ai_analysis[:500]
+        )
     
     def _create_ai_guided_slide_structure(self, title: str, sections: List[Dict[str, Any]], 
                                         themes: List[str], ai_structure: str) -> List[Dict[str, Any]]:
@@ -499,13 +764,13 @@ Keep total slides to 5 maximum.
         if not content:
             return ["Key insight from analysis", "Supporting details", "Important implications"]
         
-        # Simple extraction - could be enhanced with AI
-        sentences = [s.strip() for s in content.split('.') if s.strip()]
-        key_points = []
-        
-        for sentence in sentences[:4]:  # Max 4 points per slide
-            if len(sentence) > 20 and len(sentence) < 150:
-                key_points.append(sentence)
+        # Simple extraction - could be enhanced with AI. Only the first four
+        # sentences are considered, so scan lazily instead of splitting it all
+        sentences = filter(None, (match.group().strip() for match in _SENTENCE_PATTERN.finditer(content)))
+        key_points = [
+            sentence for sentence in islice(sentences, 4)  # Max 4 points per slide
+            if 20 < len(sentence) < 150
+        ]
         
         return key_points if key_points else ["Key insight from the content analysis"]
     
@@ -552,54 +817,34 @@ class VisualContentAgent:
         Returns:
             StepResult with visual content data
         """
-        start_time = datetime.now()
-        logger.info(f"🎨 Step {self.step_number}: {self.agent_name} - Generating visual content...")
+        start_time = time.perf_counter()
+        logger.info("🎨 Step %s: %s - Generating visual content...", self.step_number, self.agent_name)
         
-        try:
-            themes = document_analysis.get("themes", [])
-            slides = slide_structure.get("slide_structure", [])
-            
-            visual_specs = self._generate_visual_specifications(slides, themes)
-            color_palette = self._suggest_color_palette(themes)
-            
-            logger.info(f"   🖼️ Generated {len(visual_specs)} visual specifications")
-            logger.info(f"   🎨 Color palette: {', '.join(color_palette)}")
-            
-            result_data = {
-                "visual_specifications": visual_specs,
-                "color_palette": color_palette,
-                "design_guidelines": self._create_design_guidelines(themes),
-                "font_recommendations": ["Arial", "Calibri", "Helvetica"],
-                "image_requirements": {
-                    "aspect_ratio": "16:9",
-                    "resolution": "1920x1080",
-                    "style": "professional, modern, clean"
-                }
+        themes = document_analysis.get("themes", [])
+        slides = slide_structure.get("slide_structure", [])
+        
+        visual_specs = self._generate_visual_specifications(slides, themes)
+        color_palette = self._suggest_color_palette(themes)
+        
+        logger.info("   🖼️ Generated %s visual specifications", len(visual_specs))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   🎨 Color palette: %s", ', '.join(color_palette))
+        
+        result_data = {
+            "visual_specifications": visual_specs,
+            "color_palette": color_palette,
+            "design_guidelines": self._create_design_guidelines(themes),
+            "font_recommendations": ["Arial", "Calibri", "Helvetica"],
+            "image_requirements": {
+                "aspect_ratio": "16:9",
+                "resolution": "1920x1080",
+                "style": "professional, modern, clean"
             }
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"✅ Step {self.step_number}: Visual content generation completed in {processing_time:.2f}s")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.COMPLETED,
-                data=result_data,
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat()
-            )
-            
-        except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ Step {self.step_number}: Visual content generation failed: {e}")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.FAILED,
-                data={},
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat(),
-                error_message=str(e)
-            )
+        }
+        
+        result = _completed_step(self.agent_name, result_data, start_time)
+        logger.info("✅ Step %s: Visual content generation completed in %.2fs", self.step_number, result.processing_time)
+        return result
     
     def _generate_visual_specifications(self, slides: List[Dict[str, Any]], themes: List[str]) -> List[Dict[str, Any]]:
         """Generate visual specifications for each slide"""
@@ -699,87 +944,72 @@ class SlideGenerationAgent:
         self.agent_name = "Slide Generation Agent"
         self.step_number = 4
     
-    def process(self, document_analysis: Dict[str, Any], slide_structure: Dict[str, Any], visual_content: Dict[str, Any]) -> StepResult:
+    def process(self, document_analysis: Dict[str, Any], slide_structure: Dict[str, Any],
+                visual_content: Optional[Dict[str, Any]] = None) -> StepResult:
         """
         Generate detailed slide content
         
         Args:
             document_analysis: Result from DocumentAnalysisAgent
             slide_structure: Result from ContentStructureAgent
-            visual_content: Result from VisualContentAgent
+            visual_content: Result from VisualContentAgent (optional; slide
+                content does not depend on it)
             
         Returns:
             StepResult with detailed slide content
         """
-        start_time = datetime.now()
-        logger.info(f"📝 Step {self.step_number}: {self.agent_name} - Generating slide content...")
+        start_time = time.perf_counter()
+        logger.info("📝 Step %s: %s - Generating slide content...", self.step_number, self.agent_name)
         
-        try:
-            slides = slide_structure.get("slide_structure", [])
-            sections = document_analysis.get("sections", [])
-            
-            detailed_slides = self._generate_detailed_slides(slides, sections)
-            
-            logger.info(f"   📄 Generated content for {len(detailed_slides)} slides")
-            
-            result_data = {
-                "detailed_slides": detailed_slides,
-                "content_summary": {
-                    "total_slides": len(detailed_slides),
-                    "total_bullet_points": sum(len(slide.get("content_points", [])) for slide in detailed_slides),
-                    "content_density": "Optimized for 5-slide format"
-                }
+        slides = slide_structure.get("slide_structure", [])
+        sections = document_analysis.get("sections", [])
+        
+        # Formatted once per run rather than inside the per-slide helpers
+        generated_on = datetime.now().strftime('%B %d, %Y')
+        detailed_slides = self._generate_detailed_slides(slides, sections, generated_on)
+        
+        logger.info("   📄 Generated content for %s slides", len(detailed_slides))
+        
+        result_data = {
+            "detailed_slides": detailed_slides,
+            "content_summary": {
+                "total_slides": len(detailed_slides),
+                "total_bullet_points": sum(len(slide.get("content_points", [])) for slide in detailed_slides),
+                "content_density": "Optimized for 5-slide format"
             }
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"✅ Step {self.step_number}: Slide content generation completed in {processing_time:.2f}s")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.COMPLETED,
-                data=result_data,
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat()
-            )
-            
-        except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ Step {self.step_number}: Slide content generation failed: {e}")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.FAILED,
-                data={},
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat(),
-                error_message=str(e)
-            )
+        }
+        
+        result = _completed_step(self.agent_name, result_data, start_time)
+        logger.info("✅ Step %s: Slide content generation completed in %.2fs", self.step_number, result.processing_time)
+        return result
     
-    def _generate_detailed_slides(self, slides: List[Dict[str, Any]], sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_detailed_slides(self, slides: List[Dict[str, Any]], sections: List[Dict[str, Any]],
+                                  generated_on: str) -> List[Dict[str, Any]]:
         """Generate detailed content for each slide"""
-        detailed_slides = []
+        # Each section's key message feeds both its content slide and the
+        # conclusion, so extract it once up front
+        key_messages = [self._extract_key_message(section["content"]) for section in sections]
         
-        for slide in slides:
+        # The helpers build new dicts rather than filling in `slide`: these are
+        # the step 2 structure dicts, which stay in the workflow results as that
+        # step's output and must keep their own "content_points"
+        def detail(slide: Dict[str, Any]) -> Dict[str, Any]:
             slide_type = slide.get("type", "content")
             
             if slide_type == "title":
-                detailed_slide = self._create_title_slide_content(slide)
-            elif slide_type == "conclusion":
-                detailed_slide = self._create_conclusion_slide_content(slide, sections)
-            else:
-                # Find corresponding section for content slides
-                section_index = slide.get("slide_number", 2) - 2  # Adjust for title slide
-                if 0 <= section_index < len(sections):
-                    section = sections[section_index]
-                    detailed_slide = self._create_content_slide_content(slide, section)
-                else:
-                    detailed_slide = self._create_generic_content_slide(slide)
+                return self._create_title_slide_content(slide, generated_on)
+            if slide_type == "conclusion":
+                return self._create_conclusion_slide_content(slide, key_messages)
             
-            detailed_slides.append(detailed_slide)
+            # Find corresponding section for content slides
+            section_index = slide.get("slide_number", 2) - 2  # Adjust for title slide
+            if 0 <= section_index < len(sections):
+                return self._create_content_slide_content(slide, sections[section_index], key_messages[section_index])
+            return self._create_generic_content_slide(slide)
         
-        return detailed_slides
+        return [detail(slide) for slide in slides]
     
-    def _create_title_slide_content(self, slide: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_title_slide_content(self, slide: Dict[str, Any], generated_on: str) -> Dict[str, Any]:
         """Create title slide content"""
         return {
             **slide,
@@ -789,40 +1019,35 @@ class SlideGenerationAgent:
             "slide_content": {
                 "main_title": slide.get("title", "Presentation Title"),
                 "subtitle": slide.get("subtitle", "Overview and Key Insights"),
-                "footer_text": f"Generated on {datetime.now().strftime('%B %d, %Y')}"
+                "footer_text": f"Generated on {generated_on}"
             }
         }
     
-    def _create_content_slide_content(self, slide: Dict[str, Any], section: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_content_slide_content(self, slide: Dict[str, Any], section: Dict[str, Any],
+                                      key_message: str) -> Dict[str, Any]:
         """Create content slide with bullet points"""
-        bullet_points = self._extract_bullet_points(section["content"])
+        content = section["content"]
+        bullet_points = self._extract_bullet_points(content)
         
         return {
             **slide,
             "content_points": bullet_points,
-            "content_text": section["content"][:200] + "..." if len(section["content"]) > 200 else section["content"],
-            "speaker_notes": f"Discuss each point in detail. Key themes: {', '.join(section.get('themes', []))}",
+            "content_text": content[:200] + "..." if len(content) > 200 else content,
+            "speaker_notes": f"Discuss each point in detail. Key themes: {', '.join(section.get('themes', ()))}",
             "slide_content": {
                 "main_title": slide.get("title", section["title"]),
                 "subtitle": "",
                 "content_points": bullet_points,
-                "key_message": self._extract_key_message(section["content"])
+                "key_message": key_message
             }
         }
     
-    def _create_conclusion_slide_content(self, slide: Dict[str, Any], sections: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Create conclusion slide content"""
-        key_takeaways = []
-        for section in sections:
-            takeaway = self._extract_key_message(section["content"])
-            if takeaway:
-                key_takeaways.append(takeaway)
-        
-        bullet_points = [
-            "Key insights from today's presentation",
-            "Actionable next steps",
-            "Questions and discussion"
-        ]
+    def _create_conclusion_slide_content(self, slide: Dict[str, Any], key_messages: List[str]) -> Dict[str, Any]:
+        """Create conclusion slide content from the per-section key messages"""
+        # Top 3 non-empty takeaways
+        key_takeaways = [takeaway for takeaway in key_messages if takeaway][:3]
+        
+        bullet_points = list(CONCLUSION_BULLETS)
         
         return {
             **slide,
@@ -833,7 +1058,7 @@ class SlideGenerationAgent:
                 "main_title": "Key Takeaways",
                 "subtitle": "Summary and Next Steps",
                 "content_points": bullet_points,
-                "key_takeaways": key_takeaways[:3]  # Top 3 takeaways
+                "key_takeaways": key_takeaways
             }
         }
     
@@ -841,50 +1066,23 @@ class SlideGenerationAgent:
         """Create generic content slide"""
         return {
             **slide,
-            "content_points": ["Key point 1", "Key point 2", "Key point 3"],
+            "content_points": list(GENERIC_SLIDE_POINTS),
             "content_text": "Content for this slide",
             "speaker_notes": "Discuss the main points for this section",
             "slide_content": {
                 "main_title": slide.get("title", "Content Slide"),
                 "subtitle": "",
-                "content_points": ["Key point 1", "Key point 2", "Key point 3"]
+                "content_points": list(GENERIC_SLIDE_POINTS)
             }
         }
     
     def _extract_bullet_points(self, content: str) -> List[str]:
         """Extract bullet points from content"""
-        sentences = content.split('.')
-        bullet_points = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 10 and len(sentence) < 100:
-                # Clean up the sentence
-                if not sentence.endswith('.'):
-                    sentence += '.'
-                bullet_points.append(sentence)
-                
-                if len(bullet_points) >= 4:  # Max 4 bullet points per slide
-                    break
-        
-        # Ensure we have at least 2 bullet points
-        if len(bullet_points) < 2:
-            bullet_points = [
-                "Key insight from this section",
-                "Important consideration",
-                "Actionable takeaway"
-            ]
-        
-        return bullet_points[:4]  # Max 4 bullet points
+        return list(_parse_bullet_points(content))
     
     def _extract_key_message(self, content: str) -> str:
         """Extract key message from content"""
-        sentences = content.split('.')
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 20 and len(sentence) < 150:
-                return sentence + '.'
-        return "Key insight from this section."
+        return _parse_key_message(content)
 
 class PresentationAssemblyAgent:
     """
@@ -906,55 +1104,35 @@ class PresentationAssemblyAgent:
         Returns:
             StepResult with final presentation data
         """
-        start_time = datetime.now()
-        logger.info(f"🎯 Step {self.step_number}: {self.agent_name} - Assembling final presentation...")
+        start_time = time.perf_counter()
+        logger.info("🎯 Step %s: %s - Assembling final presentation...", self.step_number, self.agent_name)
         
-        try:
-            document_analysis = all_results.get("document_analysis", {})
-            slide_structure = all_results.get("slide_structure", {})
-            visual_content = all_results.get("visual_content", {})
-            slide_content = all_results.get("slide_content", {})
-            
-            final_presentation = self._assemble_presentation(
-                document_analysis, slide_structure, visual_content, slide_content
-            )
-            
-            logger.info(f"   🎉 Assembled complete presentation with {len(final_presentation.get('slide_structure', []))} slides")
-            
-            result_data = {
-                "final_presentation": final_presentation,
-                "assembly_summary": {
-                    "total_slides": len(final_presentation.get("slide_structure", [])),
-                    "estimated_duration": final_presentation.get("presentation_metadata", {}).get("estimated_duration", "10-15 minutes"),
-                    "ready_for_export": True
-                },
-                "export_options": ["HTML", "PowerPoint", "PDF"],
-                "quality_metrics": self._calculate_quality_metrics(final_presentation)
-            }
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"✅ Step {self.step_number}: Presentation assembly completed in {processing_time:.2f}s")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.COMPLETED,
-                data=result_data,
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat()
-            )
-            
-        except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ Step {self.step_number}: Presentation assembly failed: {e}")
-            
-            return StepResult(
-                step_name=self.agent_name,
-                status=WorkflowStatus.FAILED,
-                data={},
-                processing_time=processing_time,
-                timestamp=datetime.now().isoformat(),
-                error_message=str(e)
-            )
+        document_analysis = all_results.get("document_analysis", {})
+        slide_structure = all_results.get("slide_structure", {})
+        visual_content = all_results.get("visual_content", {})
+        slide_content = all_results.get("slide_content", {})
+        
+        final_presentation = self._assemble_presentation(
+            document_analysis, slide_structure, visual_content, slide_content
+        )
+        
+        total_slides = len(final_presentation.get("slide_structure", []))
+        logger.info("   🎉 Assembled complete presentation with %s slides", total_slides)
+        
+        result_data = {
+            "final_presentation": final_presentation,
+            "assembly_summary": {
+                "total_slides": total_slides,
+                "estimated_duration": final_presentation.get("presentation_metadata", {}).get("estimated_duration", "10-15 minutes"),
+                "ready_for_export": True
+            },
+            "export_options": ["HTML", "PowerPoint", "PDF"],
+            "quality_metrics": self._calculate_quality_metrics(final_presentation)
+        }
+        
+        result = _completed_step(self.agent_name, result_data, start_time)
+        logger.info("✅ Step %s: Presentation assembly completed in %.2fs", self.step_number, result.processing_time)
+        return result
     
     def _assemble_presentation(self, document_analysis: Dict[str, Any], slide_structure: Dict[str, Any], 
                              visual_content: Dict[str, Any], slide_content: Dict[str, Any]) -> Dict[str, Any]:
@@ -962,23 +1140,28 @@ class PresentationAssemblyAgent:
         
         slides = slide_content.get("detailed_slides", [])
         visual_specs = visual_content.get("visual_specifications", [])
+        presentation_metadata = slide_structure.get("presentation_metadata", {})
+        
+        # Index visual specs by slide number (first spec wins, as before) so each
+        # slide is matched with a single lookup
+        spec_by_number = {}
+        for visual_spec in visual_specs:
+            spec_by_number.setdefault(visual_spec.get("slide_number"), visual_spec)
         
         # Merge visual specifications with slide content
+        get_spec = spec_by_number.get
         for slide in slides:
-            slide_number = slide.get("slide_number")
-            # Find matching visual spec
-            for visual_spec in visual_specs:
-                if visual_spec.get("slide_number") == slide_number:
-                    slide["visual_prompt"] = visual_spec.get("visual_prompt", "")
-                    slide["style_notes"] = visual_spec.get("style_notes", "")
-                    break
+            visual_spec = get_spec(slide.get("slide_number"))
+            if visual_spec is not None:
+                slide["visual_prompt"] = visual_spec.get("visual_prompt", "")
+                slide["style_notes"] = visual_spec.get("style_notes", "")
         
         return {
             "metadata": {
                 "title": document_analysis.get("document_title", "Presentation"),
                 "created_date": datetime.now().isoformat(),
                 "total_slides": len(slides),
-                "estimated_duration": slide_structure.get("presentation_metadata", {}).get("estimated_duration", "10-15 minutes"),
+                "estimated_duration": presentation_metadata.get("estimated_duration", "10-15 minutes"),
                 "themes": document_analysis.get("themes", []),
                 "format": "5-slide presentation"
             },
@@ -988,7 +1171,7 @@ class PresentationAssemblyAgent:
                 "style": visual_content.get("design_guidelines", {})
             },
             "slide_structure": slides,
-            "presentation_metadata": slide_structure.get("presentation_metadata", {}),
+            "presentation_metadata": presentation_metadata,
             "ai_structure_plan": slide_structure.get("ai_structure_plan", ""),
             "export_ready": True
         }
@@ -1005,12 +1188,40 @@ class PresentationAssemblyAgent:
             "overall_quality": "Ready for presentation"
         }
 
+def _analyze_document(document_text: str) -> StepResult:
+    """Run document analysis for one document (module-level so worker processes can pickle it)"""
+    return _run_agent(DocumentAnalysisAgent(), document_text)
+
 class SequentialWorkflowCoordinator:
     """
     Workflow Coordinator
     Manages the sequential execution of all agents
     """
     
+    _STEP_DESCRIPTIONS = {
+        1: "Analyzes input document and extracts structured information",
+        2: "Plans presentation structure with 5-slide format",
+        3: "Generates visual specifications and design guidelines",
+        4: "Creates detailed slide content with bullet points",
+        5: "Assembles final presentation ready for export"
+    }
+    
+    # How execute_single_step unpacks its input_data into each agent's arguments
+    _STEP_ARGUMENTS = {
+        1: lambda input_data: (input_data,),
+        2: lambda input_data: (input_data,),
+        3: lambda input_data: (
+            input_data.get("document_analysis", {}),
+            input_data.get("slide_structure", {})
+        ),
+        4: lambda input_data: (
+            input_data.get("document_analysis", {}),
+            input_data.get("slide_structure", {}),
+            input_data.get("visual_content", {})
+        ),
+        5: lambda input_data: (input_data,)
+    }
+    
     def __init__(self):
         self.workflow_name = "Sequential Presentation Generation"
         self.agents = {
@@ -1032,16 +1243,16 @@ class SequentialWorkflowCoordinator:
         Returns:
             Complete workflow results
         """
-        start_time = datetime.now()
-        logger.info(f"🚀 Starting {self.workflow_name}")
-        logger.info(f"📊 Pipeline: {len(self.agents)} sequential steps")
+        start_time = time.perf_counter()
+        logger.info("🚀 Starting %s", self.workflow_name)
+        logger.info("📊 Pipeline: %s sequential steps", len(self.agents))
         
         workflow_results = {}
         all_results = {}
         
         try:
             # Step 1: Document Analysis
-            doc_result = self.agents[1].process(document_text)
+            doc_result = _run_agent(self.agents[1], document_text)
             workflow_results["step_1_document_analysis"] = doc_result
             if doc_result.status == WorkflowStatus.COMPLETED:
                 all_results["document_analysis"] = doc_result.data
@@ -1049,7 +1260,7 @@ class SequentialWorkflowCoordinator:
                 raise Exception(f"Step 1 failed: {doc_result.error_message}")
             
             # Step 2: Content Structure
-            structure_result = self.agents[2].process(all_results["document_analysis"])
+            structure_result = _run_agent(self.agents[2], all_results["document_analysis"])
             workflow_results["step_2_content_structure"] = structure_result
             if structure_result.status == WorkflowStatus.COMPLETED:
                 all_results["slide_structure"] = structure_result.data
@@ -1057,7 +1268,7 @@ class SequentialWorkflowCoordinator:
                 raise Exception(f"Step 2 failed: {structure_result.error_message}")
             
             # Step 3: Visual Content
-            visual_result = self.agents[3].process(all_results["document_analysis"], all_results["slide_structure"])
+            visual_result = _run_agent(self.agents[3], all_results["document_analysis"], all_results["slide_structure"])
             workflow_results["step_3_visual_content"] = visual_result
             if visual_result.status == WorkflowStatus.COMPLETED:
                 all_results["visual_content"] = visual_result.data
@@ -1065,9 +1276,10 @@ class SequentialWorkflowCoordinator:
                 raise Exception(f"Step 3 failed: {visual_result.error_message}")
             
             # Step 4: Slide Generation
-            content_result = self.agents[4].process(
-                all_results["document_analysis"], 
-                all_results["slide_structure"], 
+            content_result = _run_agent(
+                self.agents[4],
+                all_results["document_analysis"],
+                all_results["slide_structure"],
                 all_results["visual_content"]
             )
             workflow_results["step_4_slide_generation"] = content_result
@@ -1077,15 +1289,15 @@ class SequentialWorkflowCoordinator:
                 raise Exception(f"Step 4 failed: {content_result.error_message}")
             
             # Step 5: Presentation Assembly
-            assembly_result = self.agents[5].process(all_results)
+            assembly_result = _run_agent(self.agents[5], all_results)
             workflow_results["step_5_presentation_assembly"] = assembly_result
             if assembly_result.status == WorkflowStatus.COMPLETED:
                 all_results["final_presentation"] = assembly_result.data
             else:
                 raise Exception(f"Step 5 failed: {assembly_result.error_message}")
             
-            total_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"🎉 Workflow completed successfully in {total_time:.2f}s")
+            total_time = time.perf_counter() - start_time
+            logger.info("🎉 Workflow completed successfully in %.2fs", total_time)
             
             # Extract slides for compatibility
             final_presentation = all_results["final_presentation"]["final_presentation"]  # Fixed: nested structure
@@ -1107,8 +1319,8 @@ class SequentialWorkflowCoordinator:
             }
             
         except Exception as e:
-            total_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"💥 Workflow failed: {e}")
+            total_time = time.perf_counter() - start_time
+            logger.error("💥 Workflow failed: %s", e)
             
             return {
                 "status": "failed",
@@ -1122,6 +1334,51 @@ class SequentialWorkflowCoordinator:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def execute_batch_workflow(self, document_texts: List[str], max_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        Execute the full workflow for several documents concurrently
+        
+        Each workflow spends most of its time waiting on Gemini, so documents are
+        run on a small thread pool. Keep max_workers low to stay within API
+        rate limits.
+        
+        Args:
+            document_texts: Input document texts
+            max_workers: Maximum number of workflows running at once
+            
+        Returns:
+            Workflow results in the same order as document_texts
+        """
+        logger.info("📚 Running %s for %s documents", self.workflow_name, len(document_texts))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.execute_full_workflow, document_texts))
+    
+    def execute_batch_analysis(self, document_texts: List[str], max_workers: Optional[int] = None) -> List[StepResult]:
+        """
+        Run document analysis (Step 1) for several documents in parallel
+        
+        In offline mode the analysis is pure-Python text parsing bound by the GIL,
+        so documents are spread across worker processes. With Gemini available the
+        work is network-bound and threads are used instead (gRPC channels do not
+        survive a fork).
+        
+        Args:
+            document_texts: Input document texts
+            max_workers: Maximum number of parallel workers
+            
+        Returns:
+            Step 1 results in the same order as document_texts
+        """
+        if content_generator.offline:
+            executor = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers or 4)
+        
+        logger.info("📚 Analyzing %s documents in parallel", len(document_texts))
+        with executor:
+            return list(executor.map(_analyze_document, document_texts))
+    
     def execute_single_step(self, step_number: int, input_data: Any) -> StepResult:
         """
         Execute a single step in the workflow
@@ -1139,28 +1396,12 @@ class SequentialWorkflowCoordinator:
                 status=WorkflowStatus.FAILED,
                 data={},
                 processing_time=0,
-                timestamp=datetime.now().isoformat(),
                 error_message=f"Step {step_number} does not exist"
             )
         
-        logger.info(f"🔧 Executing single step: {step_number}")
-        
-        agent = self.agents[step_number]
-        
-        if step_number == 1:
-            return agent.process(input_data)
-        elif step_number == 2:
-            return agent.process(input_data)
-        elif step_number == 3:
-            return agent.process(input_data.get("document_analysis", {}), input_data.get("slide_structure", {}))
-        elif step_number == 4:
-            return agent.process(
-                input_data.get("document_analysis", {}),
-                input_data.get("slide_structure", {}),
-                input_data.get("visual_content", {})
-            )
-        elif step_number == 5:
-            return agent.process(input_data)
+        logger.info("🔧 Executing single step: %s", step_number)
+        
+        return _run_agent(self.agents[step_number], *self._STEP_ARGUMENTS[step_number](input_data))
     
     def get_workflow_status(self) -> Dict[str, Any]:
         """Get current workflow status and agent information"""
@@ -1180,14 +1421,18 @@ class SequentialWorkflowCoordinator:
     
     def _get_agent_description(self, step_number: int) -> str:
         """Get description for each agent"""
-        descriptions = {
-            1: "Analyzes input document and extracts structured information",
-            2: "Plans presentation structure with 5-slide format",
-            3: "Generates visual specifications and design guidelines",
-            4: "Creates detailed slide content with bullet points",
-            5: "Assembles final presentation ready for export"
-        }
-        return descriptions.get(step_number, "Agent description")
+        return self._STEP_DESCRIPTIONS.get(step_number, "Agent description")
+
+# Shared coordinator for the convenience functions; the agents keep no per-run
+# state, so one instance can serve every call
+_coordinator: Optional[SequentialWorkflowCoordinator] = None
+
+def _get_coordinator() -> SequentialWorkflowCoordinator:
+    """Return the shared workflow coordinator, creating it on first use"""
+    global _coordinator
+    if _coordinator is None:
+        _coordinator = SequentialWorkflowCoordinator()
+    return _coordinator
 
 # Convenience functions for easy usage
 def generate_presentation_sequential(document_text: str) -> Dict[str, Any]:
@@ -1200,8 +1445,7 @@ def generate_presentation_sequential(document_text: str) -> Dict[str, Any]:
     Returns:
         Complete presentation generation results
     """
-    coordinator = SequentialWorkflowCoordinator()
-    return coordinator.execute_full_workflow(document_text)
+    return _get_coordinator().execute_full_workflow(document_text)
 
 def get_workflow_info() -> Dict[str, Any]:
     """
@@ -1210,5 +1454,4 @@ def get_workflow_info() -> Dict[str, Any]:
     Returns:
         Workflow information and agent details
     """
-    coordinator = SequentialWorkflowCoordinator()
-    return coordinator.get_workflow_status() 
\ No newline at end of file
+    return _get_coordinator().get_workflow_status() 
\ No newline at end of file
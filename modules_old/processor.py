@@ -4,9 +4,12 @@ Bridges Streamlit UI with sequential agents workflow.
 """
 
 import streamlit as st
-import PyPDF2
-import io
+import asyncio
+import hashlib
+import fitz  # PyMuPDF
+import html
 import logging
+from itertools import chain, repeat
 from typing import List, Dict, Any
 from datetime import datetime
 
@@ -16,166 +19,19 @@ from modules.models import ContentExtractionResult, KeySection, HTMLSlide
 
 logger = logging.getLogger(__name__)
 
-async def process_pdf_to_presentation(uploaded_file):
-    """
-    Main processing function for Streamlit app.
-    Processes uploaded file and generates presentation using sequential agents.
-    """
-    try:
-        st.info("🔍 Extracting text from uploaded document...")
-        
-        # Extract text based on file type
-        document_text = extract_text_from_file(uploaded_file)
-        
-        if not document_text.strip():
-            st.error("❌ No text could be extracted from the file")
-            return
-        
-        st.info(f"📄 Extracted {len(document_text)} characters from document")
-        
-        # Initialize workflow coordinator
-        st.info("🤖 Initializing AI-powered presentation workflow...")
-        coordinator = SequentialWorkflowCoordinator()
-        
-        # Execute sequential workflow with progress updates
-        with st.spinner("🎨 AI agents are creating your presentation..."):
-            result = coordinator.execute_full_workflow(document_text)
-        
-        if result.get("status") != "success":
-            st.error(f"❌ Workflow failed: {result.get('error', 'Unknown error')}")
-            return
-        
-        # Generate HTML presentation
-        st.info("🎨 Generating HTML presentation...")
-        html_generator = HTMLPresentationGenerator()
-        html_result = html_generator.generate_html_presentation(document_text)
-        
-        if html_result.get("status") != "success":
-            st.error(f"❌ HTML generation failed: {html_result.get('error', 'Unknown error')}")
-            return
-        
-        # Update session state with results
-        update_session_state(result, html_result, uploaded_file.name)
-        
-        st.success("✅ Presentation generated successfully!")
-        st.balloons()
-        
-    except Exception as e:
-        logger.error(f"Processing failed: {e}")
-        st.error(f"❌ Processing failed: {str(e)}")
-        st.session_state.process_complete = False
-
-def extract_text_from_file(uploaded_file) -> str:
-    """Extract text from uploaded file based on file type."""
-    file_extension = uploaded_file.name.split('.')[-1].lower()
-    
-    if file_extension == 'pdf':
-        return extract_pdf_text(uploaded_file)
-    elif file_extension in ['txt', 'md']:
-        return uploaded_file.getvalue().decode('utf-8')
-    else:
-        raise ValueError(f"Unsupported file type: {file_extension}")
-
-def extract_pdf_text(pdf_file) -> str:
-    """Extract text from PDF file using PyPDF2."""
-    try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        for page_num, page in enumerate(pdf_reader.pages):
-            try:
-                page_text = page.extract_text()
-                if page_text.strip():
-                    text += page_text + "\n\n"
-            except Exception as e:
-                logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
-                continue
-        
-        if not text.strip():
-            raise ValueError("No text could be extracted from the PDF")
-        
-        return text.strip()
-        
-    except Exception as e:
-        raise ValueError(f"Failed to process PDF file: {str(e)}")
-
-def update_session_state(workflow_result: Dict[str, Any], html_result: Dict[str, Any], filename: str):
-    """Update Streamlit session state with results to match app.py expectations."""
-    
-    # Get title from workflow slides
-    slides = workflow_result.get("slides", [])
-    title = slides[0].get("title", filename.replace('.pdf', '').replace('.txt', '').replace('.md', '')) if slides else filename
-    
-    # Create ContentExtractionResult object
-    extraction_result = ContentExtractionResult(
-        document_title=title,
-        summary="AI-powered presentation generated successfully",
-        overall_themes=["AI Generated", "Professional"],
-        key_sections=create_key_sections_from_slides(slides)
-    )
-    
-    # Create HTML slides from the HTML result
-    html_slides = create_html_slides_from_result(html_result, workflow_result)
-    
-    # Update session state
-    st.session_state.key_sections = extraction_result
-    st.session_state.slides_html = html_slides
-    st.session_state.process_complete = True
-    st.session_state.image_prompts = []  # Not used in current workflow
-    st.session_state.generated_images = []  # Not used in current workflow
-
-def create_key_sections_from_slides(slides: List[Dict[str, Any]]) -> List[KeySection]:
-    """Create KeySection objects from workflow slides."""
-    sections = []
-    
-    for i, slide in enumerate(slides):
-        # Skip title slide for sections
-        if slide.get("type") == "title":
-            continue
-            
-        key_section = KeySection(
-            title=slide.get("title", f"Section {i}"),
-            content=slide.get("content_text", ""),
-            importance=7,  # Default importance
-            themes=[slide.get("type", "content")],
-            visual_elements=[]
-        )
-        sections.append(key_section)
-    
-    return sections
+# Extracted text shorter than this, or with too few letters/digits in its
+# opening sample, is image-only or garbled and not worth an LLM workflow run
+MIN_DOCUMENT_CHARS = 200
+MIN_ALNUM_RATIO = 0.3
+QUALITY_SAMPLE_CHARS = 4096
 
-def create_html_slides_from_result(html_result: Dict[str, Any], workflow_result: Dict[str, Any]) -> List[HTMLSlide]:
-    """Create HTMLSlide objects from HTML generation results."""
-    slides = []
-    
-    # Get slides from HTML result
-    html_slides_data = html_result.get("slides", [])
-    
-    # Get slides directly from workflow result
-    workflow_slides = workflow_result.get("slides", [])
-    
-    for i, slide_data in enumerate(html_slides_data):
-        # Get corresponding workflow slide data
-        workflow_slide = workflow_slides[i] if i < len(workflow_slides) else {}
-        
-        html_slide = HTMLSlide(
-            html_content=generate_slide_html(slide_data, i, len(html_slides_data)),
-            title=slide_data.get("title", workflow_slide.get("title", f"Slide {i+1}")),
-            section_title=slide_data.get("title", ""),
-            section_content=slide_data.get("content", workflow_slide.get("content_text", ""))
-        )
-        slides.append(html_slide)
-    
-    return slides
+# Generated presentations kept per session for re-uploads; each holds the
+# whole workflow and HTML results, so only the most recently used are kept
+MAX_CACHED_PRESENTATIONS = 3
 
-def generate_slide_html(slide_data: Dict[str, Any], slide_num: int, total_slides: int) -> str:
-    """Generate HTML content for a single slide."""
-    
-    slide_type = slide_data.get("type", "content")
-    title = slide_data.get("title", f"Slide {slide_num + 1}")
-    
-    # Base HTML structure
-    html = f"""
+# Static slide scaffold, filled in with str.format (braces in the CSS are
+# doubled); only the title and slide counter vary per slide
+SLIDE_HTML_HEAD = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -250,65 +106,284 @@ def generate_slide_html(slide_data: Dict[str, Any], slide_num: int, total_slides
     </head>
     <body>
         <div class="slide">
-            <div class="slide-number">{slide_num + 1} / {total_slides}</div>
+            <div class="slide-number">{slide_number} / {total_slides}</div>
             <div class="slide-header">
                 <h1>{title}</h1>
             </div>
             <div class="content">
     """
-    
-    # Add slide-specific content
-    if slide_type == "title":
-        subtitle = slide_data.get("subtitle", "")
-        highlights = slide_data.get("highlights", [])
-        
-        html += f"""
+
+SLIDE_HTML_FOOT = """
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+# Whole slide page: the scaffold around a per-type body, formatted in one pass
+SLIDE_HTML_PAGE = SLIDE_HTML_HEAD + "{body}" + SLIDE_HTML_FOOT
+
+# Per-slide-type body fragments, also filled in with str.format
+TITLE_SLIDE_BODY = """
                 <h2>{subtitle}</h2>
                 <ul>
-        """
-        for highlight in highlights:
-            html += f"<li>{highlight}</li>"
-        html += "</ul>"
+        {highlights}</ul>"""
+SLIDE_LIST_SECTION = "<h2>{heading}</h2><ul>{items}</ul>"
+SLIDE_LIST = "<ul>{items}</ul>"
+SLIDE_LIST_ITEM = "<li>{}</li>"
+CLOSING_STATEMENT = "<p><strong>{}</strong></p>"
+KEY_INSIGHT = "<p><strong>Key Insight:</strong> {}</p>"
+
+async def process_pdf_to_presentation(uploaded_file, regenerate: bool = False):
+    """
+    Main processing function for Streamlit app.
+    Processes uploaded file and generates presentation using sequential agents.
+    
+    Args:
+        uploaded_file: The Streamlit upload to process
+        regenerate: Run the workflows again even if this document's
+            presentation is already cached in the session
+    """
+    try:
+        # Hash the upload in place (getbuffer() is a view, not a copy); the
+        # digest keys the results of both pipelines, so re-uploading the same
+        # document skips extraction and the LLM workflows entirely
+        buffer = uploaded_file.getbuffer()
+        content_hash = hashlib.sha256(buffer).hexdigest()
+        presentation_cache = st.session_state.setdefault("presentation_cache", {})
         
-    elif slide_type == "conclusion":
-        takeaways = slide_data.get("takeaways", [])
-        next_steps = slide_data.get("next_steps", [])
-        closing_statement = slide_data.get("closing_statement", "")
+        if content_hash in presentation_cache and not regenerate:
+            st.info("♻️ Reusing the presentation already generated for this document")
+            # Re-insert so the dict stays ordered from least to most recently used
+            result, html_result = presentation_cache[content_hash] = presentation_cache.pop(content_hash)
+        else:
+            st.info("🔍 Extracting text from uploaded document...")
+            
+            # Extraction works from bytes, so copy the upload out of the buffer once
+            raw = buffer.tobytes()
+            
+            # Extract text based on file type
+            document_text = extract_text_from_file(raw, uploaded_file.name)
+            
+            if not document_text.strip():
+                st.error("❌ No text could be extracted from the file")
+                return
+            
+            if not has_usable_text(document_text):
+                st.error("❌ Document appears to be scanned or nearly empty; OCR is not supported")
+                return
+            
+            st.info(f"📄 Extracted {len(document_text)} characters from document")
+            
+            # Initialize workflow coordinator and HTML generator
+            st.info("🤖 Initializing AI-powered presentation workflow...")
+            coordinator = SequentialWorkflowCoordinator()
+            html_generator = HTMLPresentationGenerator()
+            
+            # The HTML generator works from the document text, not the workflow
+            # result, so both run at once in worker threads to overlap their LLM calls
+            st.info("🎨 Generating HTML presentation...")
+            with st.spinner("🎨 AI agents are creating your presentation..."):
+                result, html_result = await asyncio.gather(
+                    asyncio.to_thread(coordinator.execute_full_workflow, document_text),
+                    asyncio.to_thread(html_generator.generate_html_presentation, document_text)
+                )
+            
+            if result.get("status") != "success":
+                st.error(f"❌ Workflow failed: {result.get('error', 'Unknown error')}")
+                return
+            
+            if html_result.get("status") != "success":
+                st.error(f"❌ HTML generation failed: {html_result.get('error', 'Unknown error')}")
+                return
+            
+            presentation_cache.pop(content_hash, None)
+            presentation_cache[content_hash] = (result, html_result)
+            while len(presentation_cache) > MAX_CACHED_PRESENTATIONS:
+                del presentation_cache[next(iter(presentation_cache))]
         
-        if takeaways:
-            html += "<h2>Key Takeaways</h2><ul>"
-            for takeaway in takeaways:
-                html += f"<li>{takeaway}</li>"
-            html += "</ul>"
+        # Update session state with results
+        update_session_state(result, html_result, uploaded_file.name)
         
-        if next_steps:
-            html += "<h2>Next Steps</h2><ul>"
-            for step in next_steps:
-                html += f"<li>{step}</li>"
-            html += "</ul>"
+        st.success("✅ Presentation generated successfully!")
+        st.balloons()
         
-        if closing_statement:
-            html += f"<p><strong>{closing_statement}</strong></p>"
+    except Exception as e:
+        logger.error(f"Processing failed: {e}")
+        st.error(f"❌ Processing failed: {str(e)}")
+        st.session_state.process_complete = False
+
+def has_usable_text(document_text: str) -> bool:
+    """Cheap pre-check (looks at a bounded sample) that extracted text is real content."""
+    if len(document_text) < MIN_DOCUMENT_CHARS:
+        return False
+    sample = document_text[:QUALITY_SAMPLE_CHARS]
+    alnum_ratio = sum(c.isalnum() for c in sample) / len(sample)
+    return alnum_ratio >= MIN_ALNUM_RATIO
+
+def extract_text_from_file(raw: bytes, name: str) -> str:
+    """Extract text from an uploaded file's bytes based on its file name's type."""
+    file_extension = name.split('.')[-1].lower()
     
-    else:  # content slide
-        bullet_points = slide_data.get("bullet_points", [])
-        key_message = slide_data.get("key_message", "")
+    if file_extension == 'pdf':
+        return extract_pdf_text(raw)
+    elif file_extension in ['txt', 'md']:
+        return raw.decode('utf-8')
+    else:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Extract text from PDF bytes using PyMuPDF, page by page from one open document."""
+    try:
+        text_parts = []
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            for page_num, page in enumerate(doc):
+                try:
+                    page_text = page.get_text("text")
+                except Exception as e:
+                    logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
+                    continue
+                if page_text.strip():
+                    text_parts.append(page_text)
+        
+        text = "\n\n".join(text_parts).strip()
+        if not text:
+            raise ValueError("No text could be extracted from the PDF")
         
-        if bullet_points:
-            html += "<ul>"
-            for point in bullet_points:
-                html += f"<li>{point}</li>"
-            html += "</ul>"
+        return text
         
-        if key_message:
-            html += f"<p><strong>Key Insight:</strong> {key_message}</p>"
+    except Exception as e:
+        raise ValueError(f"Failed to process PDF file: {str(e)}")
+
+def update_session_state(workflow_result: Dict[str, Any], html_result: Dict[str, Any], filename: str):
+    """Update Streamlit session state with results to match app.py expectations."""
     
-    # Close HTML
-    html += """
-            </div>
-        </div>
-    </body>
-    </html>
+    # Get title from workflow slides
+    slides = workflow_result.get("slides", [])
+    title = slides[0].get("title", filename.replace('.pdf', '').replace('.txt', '').replace('.md', '')) if slides else filename
+    
+    # Create ContentExtractionResult object
+    extraction_result = _construct_model(
+        ContentExtractionResult,
+        document_title=title,
+        summary="AI-powered presentation generated successfully",
+        overall_themes=["AI Generated", "Professional"],
+        key_sections=create_key_sections_from_slides(slides)
+    )
+    
+    # Create HTML slides from the HTML result
+    html_slides = create_html_slides_from_result(html_result, workflow_result)
+    
+    # Update session state
+    st.session_state.key_sections = extraction_result
+    st.session_state.slides_html = html_slides
+    st.session_state.process_complete = True
+    st.session_state.image_prompts = []  # Not used in current workflow
+    st.session_state.generated_images = []  # Not used in current workflow
+
+def create_key_sections_from_slides(slides: List[Dict[str, Any]]) -> List[KeySection]:
+    """Create KeySection objects from workflow slides."""
+    return [
+        _construct_model(
+            KeySection,
+            title=slide.get("title", f"Section {i}"),
+            content=slide.get("content_text", ""),
+            importance=7,  # Default importance
+            themes=[slide.get("type", "content")],
+            visual_elements=[]
+        )
+        for i, slide in enumerate(slides)
+        if slide.get("type") != "title"  # Skip title slide for sections
+    ]
+
+def _construct_model(model_cls, **fields):
     """
+    Build a pydantic model without running validation.
     
-    return html 
\ No newline at end of file
+    Only for values produced by our own workflow, whose types are already
+    right; uses model_construct on pydantic v2 and construct on v1.
+    """
+    construct = getattr(model_cls, "model_construct", None) or model_cls.construct
+    return construct(**fields)
+
+def create_html_slides_from_result(html_result: Dict[str, Any], workflow_result: Dict[str, Any]) -> List[HTMLSlide]:
+    """Create HTMLSlide objects from HTML generation results."""
+    # Get slides from HTML result
+    html_slides_data = html_result.get("slides", [])
+    total_slides = len(html_slides_data)
+    
+    # Get slides directly from workflow result; pair each HTML slide with its
+    # workflow slide, padding with {} if the workflow produced fewer
+    workflow_slides = chain(workflow_result.get("slides", []), repeat({}))
+    
+    return [
+        HTMLSlide(
+            html_content=generate_slide_html(slide_data, i, total_slides),
+            title=slide_data.get("title", workflow_slide.get("title", f"Slide {i+1}")),
+            section_title=slide_data.get("title", ""),
+            section_content=slide_data.get("content", workflow_slide.get("content_text", ""))
+        )
+        for i, (slide_data, workflow_slide) in enumerate(zip(html_slides_data, workflow_slides))
+    ]
+
+def generate_slide_html(slide_data: Dict[str, Any], slide_num: int, total_slides: int) -> str:
+    """Generate HTML content for a single slide."""
+    
+    slide_type = slide_data.get("type", "content")
+    render_body = _SLIDE_BODY_RENDERERS.get(slide_type, _render_content_body)
+    
+    # Slide text comes from the LLM, so every value is escaped before it is
+    # placed into the markup
+    return SLIDE_HTML_PAGE.format(
+        title=_escape(slide_data.get("title", f"Slide {slide_num + 1}")),
+        slide_number=slide_num + 1,
+        total_slides=total_slides,
+        body=render_body(slide_data)
+    )
+
+def _render_title_body(slide_data: Dict[str, Any]) -> str:
+    """Subtitle and highlights for a title slide."""
+    return TITLE_SLIDE_BODY.format(
+        subtitle=_escape(slide_data.get("subtitle", "")),
+        highlights=_list_items(slide_data.get("highlights", []))
+    )
+
+def _render_conclusion_body(slide_data: Dict[str, Any]) -> str:
+    """Takeaways, next steps and closing statement for a conclusion slide."""
+    takeaways = slide_data.get("takeaways", [])
+    next_steps = slide_data.get("next_steps", [])
+    closing_statement = slide_data.get("closing_statement", "")
+    
+    parts = []
+    if takeaways:
+        parts.append(SLIDE_LIST_SECTION.format(heading="Key Takeaways", items=_list_items(takeaways)))
+    if next_steps:
+        parts.append(SLIDE_LIST_SECTION.format(heading="Next Steps", items=_list_items(next_steps)))
+    if closing_statement:
+        parts.append(CLOSING_STATEMENT.format(_escape(closing_statement)))
+    return "".join(parts)
+
+def _render_content_body(slide_data: Dict[str, Any]) -> str:
+    """Bullet points and key message for a content slide."""
+    bullet_points = slide_data.get("bullet_points", [])
+    key_message = slide_data.get("key_message", "")
+    
+    parts = []
+    if bullet_points:
+        parts.append(SLIDE_LIST.format(items=_list_items(bullet_points)))
+    if key_message:
+        parts.append(KEY_INSIGHT.format(_escape(key_message)))
+    return "".join(parts)
+
+_SLIDE_BODY_RENDERERS = {
+    "title": _render_title_body,
+    "conclusion": _render_conclusion_body,
+}
+
+def _list_items(values: List[Any]) -> str:
+    """Escaped <li> items for a slide list."""
+    return "".join(SLIDE_LIST_ITEM.format(_escape(value)) for value in values)
+
+def _escape(value: Any) -> str:
+    """HTML-escape a slide value (including quotes) for safe interpolation."""
+    return html.escape(str(value), quote=True) 
\ No newline at end of file
@@ -9,6 +9,13 @@ import sys
 import os
 from pathlib import Path
 
+# Same settings as `streamlit run app.py --server.port 8501 ...`
+STREAMLIT_OPTIONS = {
+    "server.port": 8501,
+    "server.address": "localhost",
+    "browser.gatherUsageStats": False,
+}
+
 def main():
     """Start the Streamlit application."""
     # Ensure we're in the correct directory
@@ -30,17 +37,35 @@ def main():
         print("⏹️  Press Ctrl+C to stop the application")
         print()
         
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", "app.py",
-            "--server.port", "8501",
-            "--server.address", "localhost",
-            "--browser.gatherUsageStats", "false"
-        ])
+        run_streamlit("app.py")
     except KeyboardInterrupt:
         print("\n👋 Application stopped by user")
     except Exception as e:
         print(f"❌ Error starting application: {e}")
         sys.exit(1)
 
+def run_streamlit(script: str):
+    """
+    Run a Streamlit script in this process, like `streamlit run` does,
+    instead of paying for a second interpreter and its imports.
+    
+    Falls back to a `python -m streamlit run` subprocess when the in-process
+    bootstrap API is not available.
+    """
+    try:
+        from streamlit.web import bootstrap
+    except ImportError:
+        command = [sys.executable, "-m", "streamlit", "run", script]
+        for name, value in STREAMLIT_OPTIONS.items():
+            command += [f"--{name}", str(value).lower() if isinstance(value, bool) else str(value)]
+        subprocess.run(command)
+        return
+    
+    # bootstrap expects the CLI's flag names, with dots replaced by underscores.
+    # run() gets them too: the config watcher reloads options from that dict.
+    flag_options = {name.replace(".", "_"): value for name, value in STREAMLIT_OPTIONS.items()}
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(script, False, [], flag_options)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -3,61 +3,199 @@ OpenAI client initialization and configuration management.
 Supports both Azure OpenAI and direct OpenAI APIs.
 """
 import os
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import httpx
 from openai import AsyncOpenAI, AsyncAzureOpenAI
+from openai.types.chat import ChatCompletion
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+@dataclass(frozen=True)
+class OpenAIConfig:
+    """API settings resolved from the environment in one place."""
+    provider: str
+    gpt_api_key: Optional[str]
+    gpt_api_version: Optional[str]
+    gpt_endpoint: Optional[str]
+    gpt_deployment: Optional[str]
+    gpt_model: str
+    dalle_api_key: Optional[str]
+    dalle_api_version: Optional[str]
+    dalle_endpoint: Optional[str]
+    dalle_deployment: Optional[str]
+    dalle_model: str
+    
+    @classmethod
+    def from_env(cls):
+        """Read the current settings from environment variables."""
+        provider = os.getenv("API_PROVIDER", "azure").lower()
+        
+        if provider == "azure":
+            # Use separate DALL-E credentials if provided, otherwise use GPT credentials
+            return cls(
+                provider=provider,
+                gpt_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                gpt_api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+                gpt_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+                gpt_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+                gpt_model=os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4"),
+                dalle_api_key=os.getenv("DALLE_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY"),
+                dalle_api_version=os.getenv("DALLE_API_VERSION", "2024-02-01"),
+                dalle_endpoint=os.getenv("DALLE_ENDPOINT") or os.getenv("AZURE_OPENAI_ENDPOINT"),
+                dalle_deployment=os.getenv("DALLE_DEPLOYMENT", "dall-e-3"),
+                dalle_model=os.getenv("DALLE_DEPLOYMENT", "dall-e-3")
+            )
+        
+        # openai: one key serves both, and only model names differ
+        api_key = os.getenv("OPENAI_API_KEY")
+        return cls(
+            provider=provider,
+            gpt_api_key=api_key,
+            gpt_api_version=None,
+            gpt_endpoint=None,
+            gpt_deployment=None,
+            gpt_model=os.getenv("OPENAI_MODEL", "gpt-4"),
+            dalle_api_key=api_key,
+            dalle_api_version=None,
+            dalle_endpoint=None,
+            dalle_deployment=None,
+            dalle_model=os.getenv("DALLE_MODEL", "dall-e-3")
+        )
+    
+    @property
+    def gpt_client_settings(self):
+        """Arguments for _create_client() for the GPT client."""
+        return (self.provider, self.gpt_api_key, self.gpt_api_version, self.gpt_endpoint, self.gpt_deployment)
+    
+    @property
+    def dalle_client_settings(self):
+        """Arguments for _create_client() for the DALL-E client."""
+        return (self.provider, self.dalle_api_key, self.dalle_api_version, self.dalle_endpoint, self.dalle_deployment)
+
+# Resolved on first use and reset by update_openai_settings()
+_config = None
+
+class _LoopClients:
+    """Connection pool and clients belonging to one event loop."""
+    
+    def __init__(self):
+        # One HTTP connection pool shared by the loop's GPT and DALL-E clients,
+        # so keep-alive connections (multiplexed over HTTP/2) are reused
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        # Clients by settings; update_openai_settings() clears these
+        self.gpt_clients = {}
+        self.dalle_clients = {}
+
+# Pooled connections are bound to the event loop that opened them, and each
+# asyncio.run() / to_thread worker has its own loop, so clients are kept per loop
+_loop_clients = weakref.WeakKeyDictionary()
+_loop_clients_lock = threading.Lock()
+
+def _get_config():
+    """Return the current settings, reading the environment only when needed."""
+    global _config
+    if _config is None:
+        _config = OpenAIConfig.from_env()
+    return _config
+
+def _get_loop_clients():
+    """Return the clients for the running event loop, or None outside of one."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    
+    with _loop_clients_lock:
+        # Forget loops that have finished; their connections can't be reused
+        for closed_loop in [known for known in _loop_clients if known.is_closed()]:
+            del _loop_clients[closed_loop]
+        
+        loop_clients = _loop_clients.get(loop)
+        if loop_clients is None:
+            loop_clients = _loop_clients[loop] = _LoopClients()
+    return loop_clients
+
 def get_api_provider():
     """Get the configured API provider (azure or openai)."""
-    return os.getenv("API_PROVIDER", "azure").lower()
+    return _get_config().provider
 
 def get_gpt_client():
     """
     Get the appropriate GPT client based on configuration.
     
+    Inside an event loop the client is reused for that loop; outside of one
+    a new client is returned, since the loop that will use it is unknown.
+    
     Returns:
-        AsyncOpenAI or AsyncAzureOpenAI: Configured client
+        CachedAsyncOpenAI: Configured client; deterministic chat completions
+        are answered from the local response cache when possible
     """
-    provider = get_api_provider()
+    settings = _get_config().gpt_client_settings
+    loop_clients = _get_loop_clients()
+    if loop_clients is None:
+        return CachedAsyncOpenAI(_create_client(*settings), settings[0])
     
-    if provider == "azure":
-        return AsyncAzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT")
-        )
-    else:  # openai
-        return AsyncOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
+    client = loop_clients.gpt_clients.get(settings)
+    if client is None:
+        client = loop_clients.gpt_clients[settings] = CachedAsyncOpenAI(
+            _create_client(*settings, http_client=loop_clients.http_client), settings[0]
         )
+    return client
 
 def get_dalle_client():
     """
     Get the appropriate DALL-E client based on configuration.
     
+    Reused per event loop, like get_gpt_client().
+    
     Returns:
         AsyncOpenAI or AsyncAzureOpenAI: Configured client
     """
-    provider = get_api_provider()
+    settings = _get_config().dalle_client_settings
+    loop_clients = _get_loop_clients()
+    if loop_clients is None:
+        return _create_client(*settings)
     
+    client = loop_clients.dalle_clients.get(settings)
+    if client is None:
+        client = loop_clients.dalle_clients[settings] = _create_client(
+            *settings, http_client=loop_clients.http_client
+        )
+    return client
+
+def _create_client(provider, api_key, api_version=None, endpoint=None, deployment=None, http_client=None):
+    """Construct a new client for the given provider settings."""
     if provider == "azure":
-        # Use separate DALL-E credentials if provided, otherwise use GPT credentials
-        dalle_key = os.getenv("DALLE_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY")
-        dalle_endpoint = os.getenv("DALLE_ENDPOINT") or os.getenv("AZURE_OPENAI_ENDPOINT")
-        
         return AsyncAzureOpenAI(
-            api_key=dalle_key,
-            api_version=os.getenv("DALLE_API_VERSION", "2024-02-01"),
-            azure_endpoint=dalle_endpoint,
-            azure_deployment=os.getenv("DALLE_DEPLOYMENT", "dall-e-3")
-        )
-    else:  # openai
-        return AsyncOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
+            api_key=api_key,
+            api_version=api_version,
+            azure_endpoint=endpoint,
+            azure_deployment=deployment,
+            http_client=http_client
         )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client)
 
 def get_gpt_model():
     """
@@ -66,12 +204,7 @@ def get_gpt_model():
     Returns:
         str: Model name
     """
-    provider = get_api_provider()
-    
-    if provider == "azure":
-        return os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4")
-    else:
-        return os.getenv("OPENAI_MODEL", "gpt-4")
+    return _get_config().gpt_model
 
 def get_dalle_model():
     """
@@ -80,12 +213,7 @@ def get_dalle_model():
     Returns:
         str: Model name
     """
-    provider = get_api_provider()
-    
-    if provider == "azure":
-        return os.getenv("DALLE_DEPLOYMENT", "dall-e-3")
-    else:
-        return os.getenv("DALLE_MODEL", "dall-e-3")
+    return _get_config().dalle_model
 
 def update_openai_settings(gpt_settings=None, dalle_settings=None, provider=None):
     """
@@ -96,8 +224,11 @@ def update_openai_settings(gpt_settings=None, dalle_settings=None, provider=None
         dalle_settings (dict): DALL-E configuration
         provider (str): API provider ("azure" or "openai")
     """
+    global _config
+    
     if provider:
         os.environ["API_PROVIDER"] = provider
+        _config = None
     
     current_provider = get_api_provider()
     
@@ -132,3 +263,160 @@ def update_openai_settings(gpt_settings=None, dalle_settings=None, provider=None
                 os.environ["OPENAI_API_KEY"] = dalle_settings["api_key"]
             if "model" in dalle_settings:
                 os.environ["DALLE_MODEL"] = dalle_settings["model"]
+    
+    # Re-read settings on next use and drop clients built from the previous ones
+    _config = None
+    with _loop_clients_lock:
+        for loop_clients in _loop_clients.values():
+            loop_clients.gpt_clients.clear()
+            loop_clients.dalle_clients.clear()
+
+# Responses to deterministic (temperature=0) chat completions, keyed by a
+# SHA-256 of the request, so re-processing the same document skips the LLM
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", Path.home() / ".cache" / "adk_ppt" / "llm_cache.sqlite"))
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+class LLMResponseCache:
+    """SQLite-backed store of serialized chat completion responses."""
+    
+    def __init__(self, path=LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL_SECONDS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response BLOB, created_at INT)"
+            )
+            self._delete_expired(conn)
+    
+    def _connect(self):
+        return sqlite3.connect(self.path)
+    
+    def _delete_expired(self, conn):
+        """Drop rows past the TTL; reads skip them anyway, so they only take up space."""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (int(time.time()) - self.ttl_seconds,))
+    
+    @staticmethod
+    def make_key(request, backend):
+        """
+        Hash the backend and every request parameter, so a different
+        endpoint, prompt or option misses.
+        
+        Args:
+            request: Keyword arguments of the create() call
+            backend: (provider, base_url) of the client that answers it; on
+                Azure `model` is a user-chosen deployment name, so it doesn't
+                identify the model on its own
+        """
+        return hashlib.sha256(_canonical_json({"backend": backend, "request": request})).hexdigest()
+    
+    def get(self, key):
+        """Return the stored response for key, or None if missing or expired."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (key, int(time.time()) - self.ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key, response):
+        """Store a serialized response under key, pruning expired ones."""
+        with closing(self._connect()) as conn, conn:
+            self._delete_expired(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, int(time.time()))
+            )
+
+def _canonical_json(payload):
+    """
+    Serialize payload to compact, key-sorted UTF-8 JSON bytes.
+    
+    Uses orjson when installed (much faster on long message lists). The two
+    backends don't always agree byte for byte (e.g. 1e16 vs 1e+16), so
+    installing or removing orjson just means cache misses. orjson also
+    rejects some payloads json accepts, such as ints wider than 64 bits.
+    
+    Raises:
+        TypeError, ValueError: If the payload can't be serialized
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+class _CachedCompletions:
+    """Proxy for client.chat.completions whose create() consults the response cache."""
+    
+    def __init__(self, completions, cache, backend):
+        self._completions = completions
+        self._cache = cache
+        self._backend = backend
+    
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+    
+    async def create(self, **kwargs):
+        # Only temperature=0 is deterministic (the API default is 1), and
+        # streamed responses can't be replayed from a stored object
+        if self._cache is None or kwargs.get("temperature") != 0 or kwargs.get("stream"):
+            return await self._completions.create(**kwargs)
+        
+        try:
+            key = self._cache.make_key(kwargs, self._backend)
+        except (TypeError, ValueError):
+            # Not serializable as a cache key; just make the call uncached
+            return await self._completions.create(**kwargs)
+        # SQLite calls block (and writes fsync), so keep them off the event loop
+        try:
+            cached = await asyncio.to_thread(self._cache.get, key)
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            return ChatCompletion.model_validate_json(cached)
+        
+        response = await self._completions.create(**kwargs)
+        try:
+            await asyncio.to_thread(self._cache.set, key, response.model_dump_json())
+        except sqlite3.Error:
+            pass  # The cache is an optimization; never fail the call over it
+        return response
+
+class _CachedChat:
+    """Proxy for client.chat exposing the caching completions resource."""
+    
+    def __init__(self, chat, cache, backend):
+        self._chat = chat
+        self.completions = _CachedCompletions(chat.completions, cache, backend)
+    
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+class CachedAsyncOpenAI:
+    """
+    Wrap an AsyncOpenAI/AsyncAzureOpenAI client so temperature=0 chat
+    completions are served from a local SQLite cache when possible.
+    
+    Every other attribute is delegated to the wrapped client unchanged.
+    """
+    
+    def __init__(self, client, provider, cache=None):
+        self._client = client
+        if cache is None:
+            try:
+                cache = _get_response_cache()
+            except (OSError, sqlite3.Error):
+                cache = None  # No writable cache location; calls go straight through
+        self.chat = _CachedChat(client.chat, cache, (provider, str(client.base_url)))
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+_response_cache = None
+
+def _get_response_cache():
+    """Open the shared response cache on first use."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache()
+    return _response_cache